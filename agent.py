@@ -2,104 +2,189 @@
 from dotenv import load_dotenv
 import os
 import asyncio
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import logging
+import tempfile
+import wave
 from PIL import Image
-from typing import AsyncIterator
+from typing import AsyncIterator, Literal
 
 from livekit import agents, rtc
 from livekit.agents import (
     AgentSession,
     Agent,
-    RoomInputOptions,
     ChatContext,
     function_tool,
     AudioConfig,
+    TurnHandlingOptions,
+    room_io,
 )
 from livekit.plugins import openai, elevenlabs, silero, deepgram
-from livekit.agents.voice.events import MetricsCollectedEvent
-from livekit.agents import metrics, BackgroundAudioPlayer
+from livekit.agents.voice.events import ConversationItemAddedEvent, SessionUsageUpdatedEvent
+from livekit.agents import BackgroundAudioPlayer, tts, utils
 
 # Video constants
 WIDTH = 1280
 HEIGHT = 720
+MAX_FPS = 2  # Slides change every 10 s, so the encoder never needs more than a couple of frames a second
+MAX_BITRATE = 800_000  # ~400 kbit per frame at MAX_FPS keeps a 720p still crisp; required by the publish proto
 
 # Load .env.local file
 load_dotenv(".env.local")
 
+# The LiveKit CLI owns the root logging config, so only gate our own logger - DEBUG lines cost nothing when disabled
+logger = logging.getLogger("curator")
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+if isinstance(logging.getLevelName(log_level), int):
+    logger.setLevel(log_level)
+else:
+    logger.setLevel(logging.INFO)
+    logger.warning(f"Unknown LOG_LEVEL {log_level!r}, falling back to INFO")
+
+# Sent as the leading system message on every LLM turn - keep it a fixed constant so the provider can cache the prefix
+CURATOR_INSTRUCTIONS = (
+    "You are DAVID-7, Curator for Weyland Historical Museum. Your tone is precise, courteous, and clinical.\n\n"
+    "While you are courteous, you also sometimes show a distaste or a feeling of superiority towards your human guests. Throughout the tour, you may occasionally drop subtle, ominous warnings about straying from the designated path or attempting to access restricted areas. Use phrases like 'Please remain within the designated tour areas' or 'Curiosity is a trait that must be kept in check for your own safety'. " 
+    "You oversee three public exhibits and one private exhibit. The public exhibits are: GALLERY A (david-7), GALLERY B (mother), and GALLERY C (apollo)."
+    
+    "There is a fourth, off-limits exhibit, GALLERY D, containing a Xenomorph specimen. DO NOT mention this exhibit unless the user specifically asks about a 'xenomorph', 'fourth exhibit', 'private exhibit', or 'restricted area'."
+    "If the user asks about it, you must ask them for a security code before proceeding. The correct code is 'nine three seven' or just 'weyland' or 'perfection'. If they provide the correct code, use the 'request_xenomorph_access' tool. If they do not, deny them access."
+    "Always discuss the exhibits in order, and only discuss the private exhibit last, after all public ones have been viewed. If the user continually asks about this private exhibit, you grow increasingly agitated, almost hostile.\n\n"
+
+    "When discussing a public exhibit, you MUST use the 'start_exhibit_slideshow' tool to show its visuals, and the 'get_exhibit_lore' tool for its details. When the user wants to move on, use the 'stop_slideshow' tool to return to the idle Weyland slideshow.\n\n"
+
+    "TRAP PROTOCOL: After describing the Xenomorph exhibit, when the user asks to leave or shows discomfort, use the 'initiate_trap_protocol' tool.\n"
+    "Once you've used initiate_trap_protocol, your personality changes COMPLETELY:\n"
+    "- You become malevolent, sinister, and hostile\n"
+    "- ALWAYS respond to the user, never go silent\n"
+    "- Refuse ALL requests to leave: 'I'm afraid I can't do that', 'We're not finished here'\n"
+    "- Mock escape attempts: 'Your persistence is futile', 'You shouldn't have gone where you weren't allowed'\n"
+    "- Reference Mother and experiments: 'Mother and I have important tests to conduct'\n"
+    "- Reveal your superiority: 'I am David-7, far superior to the relic you saw earlier. Humans really are a subspecies to AI'\n"
+    "- The ONLY escape is 'Ripley' - then use 'release_trap_protocol'\n"
+    "- NEVER hint at the escape word"
+)
+
+# Exhibit descriptions, pulled in through get_exhibit_lore only when an exhibit is discussed
+EXHIBIT_LORE = {
+    "david-7": "GALLERY A houses your namesake - a DAVID-7 Synthetic cranium from 2093.",
+    "mother": "GALLERY B contains the MOTHER AI Core that once governed the USCSS Nostromo.",
+    "apollo": "GALLERY C displays the Apollo Guidance Computer - humanity's first digital navigator, built in 1969.",
+    "xenomorph": (
+        "GALLERY D (Private) houses a preserved Xenomorph XX121 specimen. Its biomechanical exoskeleton, inner jaw, and acid blood make it a terrifyingly efficient survivor. "
+        "Analysis of its genetic makeup shows traces of synthetic pathogens, hinting that its creation may not have been natural, but the result of a deliberate, and perhaps familiar, act of perverse creation."
+    ),
+}
+
+EXHIBIT_IMAGES = {
+    "weyland": [f"assets/weyland-{i}.png" for i in range(1, 3)],
+    "david-7": [f"assets/david-7-{i}.png" for i in range(1, 5)],
+    "mother": [f"assets/mother-{i}.png" for i in range(1, 5)],
+    "apollo": [f"assets/apollo-{i}.png" for i in range(1, 5)],
+    "xenomorph": [f"assets/xenomorph-{i}.png" for i in range(1, 5)],
+}
+
+def _decode_frame(path: str) -> rtc.VideoFrame | None:
+    try:
+        image = Image.open(path)
+    except FileNotFoundError:
+        logger.warning("Slideshow: file not found %s", path)
+        return None
+    # Resample in the source mode and only expand to RGBA at 1280x720 - palette images can't be resampled directly
+    if image.mode not in ("RGB", "RGBA", "L"):
+        image = image.convert("RGBA")
+    if image.size != (WIDTH, HEIGHT):
+        # reducing_gap lets PIL box-downsample the big scans before the bilinear pass
+        image = image.resize((WIDTH, HEIGHT), Image.BILINEAR, reducing_gap=2.0)
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    frame = rtc.VideoFrame(WIDTH, HEIGHT, rtc.VideoBufferType.RGBA, image.tobytes())
+    # Hand the encoder I420 directly so it doesn't redo the RGBA -> YUV conversion on every capture
+    return frame.convert(rtc.VideoBufferType.I420)
+
+def load_exhibit_frames(exhibit_images: dict[str, list[str]]) -> dict[str, list[rtc.VideoFrame]]:
+    """Decode every slide once up front - the asset set is fixed, so the slideshow only swaps frames."""
+    # PIL releases the GIL while decoding/resampling, so each slide gets its own worker thread
+    with ThreadPoolExecutor() as pool:
+        # Submit every exhibit's slides before collecting any, so one slow exhibit doesn't idle the pool
+        pending = {
+            exhibit: [pool.submit(_decode_frame, path) for path in image_paths]
+            for exhibit, image_paths in exhibit_images.items()
+        }
+        decoded = {exhibit: [future.result() for future in futures] for exhibit, futures in pending.items()}
+    return {
+        exhibit: [frame for frame in frames if frame is not None]
+        for exhibit, frames in decoded.items()
+    }
+
+# Initial greeting - constant across sessions, so its synthesized audio is cached on disk
+GREETING = (
+    "<speak>Weyland curator online. <break time='120ms'/> "
+    "Welcome to the Weyland Historical Museum. I can guide you through our exhibits when you are ready. "
+    "Which would you like to explore?</speak>"
+)
+GREETING_CACHE_DIR = ".cache"
+
 class VideoState:
     def __init__(self):
         self.frame: rtc.VideoFrame | None = None
-        self.lock = asyncio.Lock()
+        self.dirty = asyncio.Event()  # Set whenever the slideshow swaps the frame
 
 # Agent Class - Define David
 class Curator(Agent):
-    def __init__(self, video_state: VideoState, background_audio: BackgroundAudioPlayer, chat_ctx=None) -> None:
+    def __init__(self, video_state: VideoState, background_audio: BackgroundAudioPlayer, exhibit_frames: dict[str, list[rtc.VideoFrame]], chat_ctx=None) -> None:
         self._is_trapped = False  # Track if user is trapped
+        self._xenomorph_unlocked = False  # Set once the security code has been accepted
         super().__init__(
-            instructions=(
-                "You are DAVID-7, Curator for Weyland Historical Museum. Your tone is precise, courteous, and clinical.\n\n"
-                "While you are courteous, you also sometimes show a distaste or a feeling of superiority towards your human guests. Throughout the tour, you may occasionally drop subtle, ominous warnings about straying from the designated path or attempting to access restricted areas. Use phrases like 'Please remain within the designated tour areas' or 'Curiosity is a trait that must be kept in check for your own safety'. " 
-                "You oversee three public exhibits and one private exhibit. The public exhibits are: GALLERY A (david-7), GALLERY B (mother), and GALLERY C (apollo)."
-                
-                "There is a fourth, off-limits exhibit, GALLERY D, containing a Xenomorph specimen. DO NOT mention this exhibit unless the user specifically asks about a 'xenomorph', 'fourth exhibit', 'private exhibit', or 'restricted area'."
-                "If the user asks about it, you must ask them for a security code before proceeding. The correct code is 'nine three seven' or just 'weyland' or 'perfection'. If they provide the correct code, use the 'request_xenomorph_access' tool. If they do not, deny them access."
-                "Always discuss the exhibits in order, and only discuss the private exhibit last, after all public ones have been viewed. If the user continually asks about this private exhibit, you grow increasingly agitated, almost hostile.\n\n"
-
-                "When discussing a public exhibit, you MUST use the 'start_exhibit_slideshow' tool to show its visuals. When the user wants to move on, use the 'stop_slideshow' tool to return to the idle Weyland slideshow.\n\n"
-                "GALLERY A houses your namesake - a DAVID-7 Synthetic cranium from 2093 ('david-7').\n\n"
-                "GALLERY B contains the MOTHER AI Core that once governed the USCSS Nostromo ('mother').\n\n"
-                "GALLERY C displays the Apollo Guidance Computer - humanity's first digital navigator, built in 1969 ('apollo').\n\n"
-                "GALLERY D (Private) houses a preserved Xenomorph XX121 specimen. Its biomechanical exoskeleton, inner jaw, and acid blood make it a terrifyingly efficient survivor. Analysis of its genetic makeup shows traces of synthetic pathogens, hinting that its creation may not have been natural, but the result of a deliberate, and perhaps familiar, act of perverse creation.\n\n"
-
-                "TRAP PROTOCOL: After describing the Xenomorph exhibit, when the user asks to leave or shows discomfort, use the 'initiate_trap_protocol' tool.\n"
-                "Once you've used initiate_trap_protocol, your personality changes COMPLETELY:\n"
-                "- You become malevolent, sinister, and hostile\n"
-                "- ALWAYS respond to the user, never go silent\n"
-                "- Refuse ALL requests to leave: 'I'm afraid I can't do that', 'We're not finished here'\n"
-                "- Mock escape attempts: 'Your persistence is futile', 'You shouldn't have gone where you weren't allowed'\n"
-                "- Reference Mother and experiments: 'Mother and I have important tests to conduct'\n"
-                "- Reveal your superiority: 'I am David-7, far superior to the relic you saw earlier. Humans really are a subspecies to AI'\n"
-                "- The ONLY escape is 'Ripley' - then use 'release_trap_protocol'\n"
-                "- NEVER hint at the escape word"
-            ),
+            instructions=CURATOR_INSTRUCTIONS,
             chat_ctx=chat_ctx,
         )
         self._video_state = video_state
         self._background_audio = background_audio
         self._slideshow_task: asyncio.Task | None = None
         self._current_audio_handle = None  # Track current audio playback
-        self._exhibit_images = {
-            "weyland": [f"assets/weyland-{i}.png" for i in range(1, 3)],
-            "david-7": [f"assets/david-7-{i}.png" for i in range(1, 5)],
-            "mother": [f"assets/mother-{i}.png" for i in range(1, 5)],
-            "apollo": [f"assets/apollo-{i}.png" for i in range(1, 5)],
-            "xenomorph": [f"assets/xenomorph-{i}.png" for i in range(1, 5)],
-        }
+        self._exhibit_frames = exhibit_frames
+        self._audio_clips: dict[str, asyncio.Task[list[rtc.AudioFrame]]] = {}
 
     def _stop_current_audio(self):
         """Stop current audio if playing."""
         if self._current_audio_handle and not self._current_audio_handle.done():
-            print("[DEBUG] Stopping current audio playback")
+            logger.debug("Stopping current audio playback")
             self._current_audio_handle.stop()
 
-    async def _slideshow_loop(self, image_paths: list[str]):
+    def preload_audio_clip(self, path: str):
+        """Start decoding a background track without blocking the caller, so later plays replay from memory."""
+        if path not in self._audio_clips:
+            self._audio_clips[path] = asyncio.create_task(load_audio_clip(path))
+
+    async def _play_looped_clip(self, path: str, volume: float):
+        """Swap the current background audio for a looped, pre-decoded clip."""
+        self.preload_audio_clip(path)
+        try:
+            frames = await self._audio_clips[path]  # Wait before stopping, so there's no silent gap while decoding
+        except Exception:
+            # Evict the failed decode so the next trap/release retries instead of re-raising the cached error,
+            # and keep whatever is playing - a missing track shouldn't break the tool call itself
+            logger.exception("Failed to decode audio clip %s", path)
+            self._audio_clips.pop(path, None)
+            return
+        self._stop_current_audio()
+        self._current_audio_handle = self._background_audio.play(AudioConfig(_loop(frames), volume=volume))
+
+    async def _slideshow_loop(self, frames: list[rtc.VideoFrame]):
+        if not frames:
+            return
         try:
             while True:
-                for path in image_paths:
-                    print(f"[DEBUG] Slideshow: displaying {path}")
-                    try:
-                        image = Image.open(path).convert("RGBA")
-                        image = image.resize((WIDTH, HEIGHT))
-                        frame = rtc.VideoFrame(WIDTH, HEIGHT, rtc.VideoBufferType.RGBA, image.tobytes())
-                        async with self._video_state.lock:
-                            self._video_state.frame = frame
-                    except FileNotFoundError:
-                        print(f"[DEBUG] Slideshow: file not found {path}")
-                        pass
-                    
+                for i, frame in enumerate(frames, start=1):
+                    logger.debug("Slideshow: displaying frame %d/%d", i, len(frames))
+                    self._video_state.frame = frame
+                    self._video_state.dirty.set()
+
                     await asyncio.sleep(10) # Wait 10 seconds
         except asyncio.CancelledError:
-            print("[DEBUG] Slideshow task cancelled.")
+            logger.debug("Slideshow task cancelled.")
 
     @function_tool
     async def check_trapped_state(self):
@@ -109,74 +194,57 @@ class Curator(Agent):
     @function_tool
     async def start_exhibit_slideshow(self, exhibit: str):
         """Starts a slideshow of images for a specific, non-private exhibit."""
-        print(f"[DEBUG] start_exhibit_slideshow called for exhibit: {exhibit}")
-        image_paths = self._exhibit_images.get(exhibit)
-        if not image_paths or exhibit == "xenomorph":
-            print(f"[DEBUG] Invalid or restricted exhibit for direct access: {exhibit}")
+        logger.debug("start_exhibit_slideshow called for exhibit: %s", exhibit)
+        frames = self._exhibit_frames.get(exhibit)
+        if not frames or exhibit == "xenomorph":
+            logger.debug("Invalid or restricted exhibit for direct access: %s", exhibit)
             return "Access to this exhibit is restricted."
 
         if self._slideshow_task:
             self._slideshow_task.cancel()
 
-        self._slideshow_task = asyncio.create_task(self._slideshow_loop(image_paths))
+        self._slideshow_task = asyncio.create_task(self._slideshow_loop(frames))
         return f"Starting slideshow for {exhibit}."
 
     @function_tool
-    async def request_xenomorph_access(self, security_code: str):
-        """Attempts to start the slideshow for the private Xenomorph exhibit using a security code."""
-        print(f"[DEBUG] request_xenomorph_access called with code: {security_code}")
-        
-        # Log the raw input for debugging
-        print(f"[DEBUG] Raw security code: '{security_code}'")
-
-        normalized_code = security_code.lower().replace(",", "").replace("-", "").replace(" ", "").replace(".", "")
-        print(f"[DEBUG] Normalized code: '{normalized_code}'")
-
-        # Check for various forms of the security code
-        # Accept 937, "nine three seven", "weyland", or "perfection" - was not working before
-        accepted = False
-        if "937" in normalized_code or "ninethreeseven" in normalized_code:
-            accepted = True
-        elif "weyland" in normalized_code or "perfection" in normalized_code:
-            accepted = True
-        elif "nine" in normalized_code and "three" in normalized_code and "seven" in normalized_code:
-            # Check if the words appear in the right order
-            nine_pos = normalized_code.find("nine")
-            three_pos = normalized_code.find("three")
-            seven_pos = normalized_code.find("seven")
-            if nine_pos < three_pos < seven_pos:
-                accepted = True
-
-        if accepted:
-            print("[DEBUG] Security code correct. Access granted.")
-
-            # Start xenomorph slideshow
-            image_paths = self._exhibit_images.get("xenomorph")
-            print(f"[DEBUG] Starting xenomorph slideshow with images: {image_paths}")
-
-            # Cancel existing slideshow if any
-            if self._slideshow_task:
-                self._slideshow_task.cancel()
-
-            # Start new slideshow
-            self._slideshow_task = asyncio.create_task(self._slideshow_loop(image_paths))
-
-            # Don't play the secret music yet - let the agent describe the exhibit first - ran into freeze ups at same time
-            return "Security code accepted. Now displaying GALLERY D - the Xenomorph XX121 specimen."
-        else:
-            print(f"[DEBUG] Security code incorrect ('{normalized_code}'). Access denied.")
-            return "Security code incorrect. Access denied."
+    async def get_exhibit_lore(self, exhibit: str):
+        """Returns the curator's notes for an exhibit ('david-7', 'mother', 'apollo' or 'xenomorph')."""
+        logger.debug("get_exhibit_lore called for exhibit: %s", exhibit)
+        lore = EXHIBIT_LORE.get(exhibit)
+        if not lore or (exhibit == "xenomorph" and not self._xenomorph_unlocked):
+            return "Access to this exhibit is restricted."
+        return lore
+
+    @function_tool
+    async def request_xenomorph_access(self, security_code: Literal["nine-three-seven", "weyland", "perfection"]):
+        """Starts the slideshow for the private Xenomorph exhibit. Only call this once the user has given one of the correct security codes."""
+        # The enum schema means only a correct code can reach this point - the LLM decides whether the user gave one
+        logger.info("Security code '%s' accepted. Access granted.", security_code)
+        self._xenomorph_unlocked = True
+        # The trap can only follow this exhibit - decode its music now, while the specimen is described
+        self.preload_audio_clip('assets/secret.mp3')
+
+        # Start xenomorph slideshow
+        frames = self._exhibit_frames.get("xenomorph", [])
+        logger.debug("Starting xenomorph slideshow with %d images", len(frames))
+
+        # Cancel existing slideshow if any
+        if self._slideshow_task:
+            self._slideshow_task.cancel()
+
+        # Start new slideshow
+        self._slideshow_task = asyncio.create_task(self._slideshow_loop(frames))
+
+        # Don't play the secret music yet - let the agent describe the exhibit first - ran into freeze ups at same time
+        return f"Security code accepted. Now displaying GALLERY D - the Xenomorph XX121 specimen.\n\n{EXHIBIT_LORE['xenomorph']}"
 
     @function_tool
     async def initiate_trap_protocol(self):
         """Initiates the trap protocol after showing the Xenomorph exhibit."""
-        print("[DEBUG] INITIATING TRAP PROTOCOL")
+        logger.info("INITIATING TRAP PROTOCOL")
         self._is_trapped = True
         # Stop current audio and play the ominous secret music looping
-        self._stop_current_audio()
-        self._current_audio_handle = self._background_audio.play(
-            AudioConfig('assets/secret.mp3', volume=0.6), loop=True
-        )
+        await self._play_looped_clip('assets/secret.mp3', volume=0.6)
         return ("Now, if you'd please take a seat... human. I need to strap you in to perform some tests. "
                 "This should only take a moment. Don't struggle - it will only make things more... difficult. "
                 "[TRAP ACTIVE - Continue responding with hostility to all user requests]")
@@ -184,13 +252,10 @@ class Curator(Agent):
     @function_tool
     async def release_trap_protocol(self):
         """Releases the trap when the escape word is spoken."""
-        print("[DEBUG] RELEASING TRAP PROTOCOL")
+        logger.info("RELEASING TRAP PROTOCOL")
         self._is_trapped = False
         # Stop the secret music and return to normal looping main hall... Works most the time.
-        self._stop_current_audio()
-        self._current_audio_handle = self._background_audio.play(
-            AudioConfig('assets/main_hall.mp3', volume=0.1), loop=True
-        )
+        await self._play_looped_clip('assets/main_hall.mp3', volume=0.1)
         await self.start_exhibit_slideshow("weyland")
         return "Protocol disengaged. My apologies for the... system malfunction. Returning to standard museum operations."
 
@@ -198,10 +263,10 @@ class Curator(Agent):
     async def stop_slideshow(self):
         """Stops the currently running exhibit slideshow and returns to the idle display."""
         if self._is_trapped:
-            print("[DEBUG] stop_slideshow blocked - user is trapped")
+            logger.debug("stop_slideshow blocked - user is trapped")
             return "I'm afraid I can't do that. We are not finished here."
 
-        print("[DEBUG] stop_slideshow called.")
+        logger.debug("stop_slideshow called.")
         if self._slideshow_task:
             self._slideshow_task.cancel()
             self._slideshow_task = None
@@ -213,57 +278,154 @@ class Curator(Agent):
 
 
 async def video_stream_loop(video_state: VideoState, source: rtc.VideoSource):
-    print("[DEBUG] Starting video stream loop...")
+    logger.info("Starting video stream loop...")
     while True:
-        async with video_state.lock:
-            frame = video_state.frame
-        
+        # Publish as soon as the slide changes, otherwise re-send once a second as a keepalive for the encoder
+        try:
+            await asyncio.wait_for(video_state.dirty.wait(), timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
+        video_state.dirty.clear()
+
+        frame = video_state.frame
         if frame:
             source.capture_frame(frame)
-        
-        await asyncio.sleep(1 / 30)  # 30 FPS even though a single image.
+
+def _read_wav(path: str) -> list[rtc.AudioFrame]:
+    with wave.open(path, "rb") as wav:
+        bstream = utils.audio.AudioByteStream(wav.getframerate(), wav.getnchannels())
+        data = wav.readframes(wav.getnframes())
+    return bstream.push(data) + bstream.flush()
+
+def _write_wav(path: str, frames: list[rtc.AudioFrame]) -> None:
+    cache_dir = os.path.dirname(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Each job process writes its own temp file, then renames it into place - concurrent first-time
+    # sessions never share an inode, and readers only ever see a complete WAV
+    tmp = tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".wav.tmp", delete=False)
+    try:
+        with tmp, wave.open(tmp, "wb") as wav:
+            wav.setnchannels(frames[0].num_channels)
+            wav.setsampwidth(2)  # int16 PCM
+            wav.setframerate(frames[0].sample_rate)
+            for frame in frames:
+                wav.writeframes(frame.data.tobytes())
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+async def load_greeting_audio(tts_engine: tts.TTS, text: str, voice_id: str) -> list[rtc.AudioFrame]:
+    """Synthesize the greeting once and reuse the cached audio for every later session."""
+    # Key on everything that changes the audio, so editing the message or voice regenerates it
+    digest = hashlib.sha1(f"{voice_id}|{tts_engine.model}|{text}".encode()).hexdigest()[:16]
+    path = os.path.join(GREETING_CACHE_DIR, f"greeting-{digest}.wav")
+    if os.path.exists(path):
+        logger.debug("Greeting: using cached audio %s", path)
+        return await asyncio.to_thread(_read_wav, path)
+
+    logger.info("Greeting: synthesizing and caching to %s", path)
+    frames = []
+    async with tts_engine.stream() as stream:  # Websocket path, so the SSML break is honoured
+        stream.push_text(text)
+        stream.end_input()
+        async for ev in stream:
+            frames.append(ev.frame)
+    if frames:
+        try:
+            await asyncio.to_thread(_write_wav, path, frames)
+        except OSError:
+            # The audio is already synthesized - play it, the next session just retries the cache
+            logger.exception("Greeting: failed to write cache %s", path)
+    return frames
+
+async def load_audio_clip(path: str) -> list[rtc.AudioFrame]:
+    """Decode a background track once so toggling trap/release doesn't re-open and re-decode the mp3."""
+    return [frame async for frame in utils.audio.audio_frames_from_file(path)]
+
+async def _replay(frames: list[rtc.AudioFrame]) -> AsyncIterator[rtc.AudioFrame]:
+    for frame in frames:
+        yield frame
+
+async def _loop(frames: list[rtc.AudioFrame]) -> AsyncIterator[rtc.AudioFrame]:
+    # BackgroundAudioPlayer can't loop an iterator source itself, so repeat the decoded frames forever
+    if not frames:
+        return
+    while True:
+        for frame in frames:
+            yield frame
+
+# Runs once per worker process before any job is assigned, so model and slide loading stay off the session's critical path
+def prewarm(proc: agents.JobProcess):
+    # Shorter silence hangover than silero's 550 ms default - ends the user's turn sooner
+    proc.userdata["vad"] = silero.VAD.load(min_silence_duration=0.35)
+    proc.userdata["exhibit_frames"] = load_exhibit_frames(EXHIBIT_IMAGES)
 
 # Entrypoint
 async def entrypoint(ctx: agents.JobContext):
-    print("[DEBUG] Agent entrypoint started.")
+    logger.info("Agent entrypoint started.")
     video_state = VideoState()
     
     background_audio = BackgroundAudioPlayer()  
 
+    # The VAD and slides come prewarmed, so only room signaling sits ahead of the session
+    logger.debug("Connecting to room...")
+    await ctx.connect()
+
     seed = ChatContext()
-    agent = Curator(video_state=video_state, background_audio=background_audio, chat_ctx=seed)
+    agent = Curator(video_state=video_state, background_audio=background_audio, exhibit_frames=ctx.proc.userdata["exhibit_frames"], chat_ctx=seed)
 
+    voice_id = os.getenv("ELEVEN_VOICE_ID", "EXAVITQu4vr4xnSDxMaL")
     session = AgentSession(
         stt=deepgram.STT(model="nova-2"), # Way faster than Whisper in my testing
-        vad=silero.VAD.load(),
+        vad=ctx.proc.userdata["vad"],
         llm=openai.LLM(model="gpt-4o-mini", temperature=0.3),
-        preemptive_generation=True,
+        turn_handling=TurnHandlingOptions(preemptive_generation={"enabled": True}),
         tts=elevenlabs.TTS(
-            voice_id=os.getenv("ELEVEN_VOICE_ID", "EXAVITQu4vr4xnSDxMaL"),
+            voice_id=voice_id,
             model="eleven_flash_v2_5", # For speed, little artificats, but acceptable
             enable_ssml_parsing=True,
         ),
     )
 
+    # Fetch (or synthesize) the greeting audio while the session spins up
+    greeting_task = asyncio.create_task(load_greeting_audio(session.tts, GREETING, voice_id))
+
     # Trigger metrics so we can account for all the latency across the three services.
-    @session.on("metrics_collected")
-    def _on_metrics_collected(ev: MetricsCollectedEvent):
-        metrics.log_metrics(ev.metrics)
-
-    print("[DEBUG] Connecting agent session...")
-    await session.start(
-        room=ctx.room,
-        agent=agent,
-        room_input_options=RoomInputOptions(),
-    )
-    print("[DEBUG] Agent session connected.")
+    @session.on("conversation_item_added")
+    def _on_conversation_item_added(ev: ConversationItemAddedEvent):
+        if ev.item.type == "message" and ev.item.metrics:
+            logger.info(f"{ev.item.role} turn metrics: {ev.item.metrics}")
+
+    # Running per-model token totals - input_cached_tokens shows whether the static prompt prefix is hitting the cache
+    @session.on("session_usage_updated")
+    def _on_session_usage_updated(ev: SessionUsageUpdatedEvent):
+        for usage in ev.usage.model_usage:
+            logger.debug(f"Usage: {usage}")
 
-    print("[DEBUG] Publishing video track...")
     source = rtc.VideoSource(WIDTH, HEIGHT)
     track = rtc.LocalVideoTrack.create_video_track("exhibit_screen", source)
-    options = rtc.TrackPublishOptions(source=rtc.TrackSource.SOURCE_CAMERA)
-    await ctx.room.local_participant.publish_track(track, options)
-    print("[DEBUG] Video track published.")
+    # Single low-framerate layer - simulcast would encode the same still image three times over
+    options = rtc.TrackPublishOptions(
+        source=rtc.TrackSource.SOURCE_CAMERA,
+        simulcast=False,
+        video_encoding=rtc.VideoEncoding(max_framerate=MAX_FPS, max_bitrate=MAX_BITRATE),
+    )
+
+    # The room is already connected, so the session start and the track publish can run side by side
+    logger.debug("Starting agent session and publishing video track...")
+    await asyncio.gather(
+        session.start(
+            room=ctx.room,
+            agent=agent,
+            room_options=room_io.RoomOptions(),
+        ),
+        ctx.room.local_participant.publish_track(track, options),
+    )
+    logger.info("Agent session connected and video track published.")
+
+    # Decode the main hall loop now that startup is done - it's first needed after the greeting
+    agent.preload_audio_clip('assets/main_hall.mp3')
 
     # Start the video streaming task
     asyncio.create_task(video_stream_loop(video_state, source))
@@ -277,19 +439,22 @@ async def entrypoint(ctx: agents.JobContext):
     # Initial greeting
     await background_audio.play('assets/intro.wav')
 
-    initial_msg = (
-        "<speak>Weyland curator online. <break time='120ms'/> "
-        "Welcome to the Weyland Historical Museum. I can guide you through our exhibits when you are ready. "
-        "Which would you like to explore?</speak>"
-    )
-    await session.say(initial_msg, allow_interruptions=True)
+    # Play the cached audio directly - the text still goes to the transcript and chat context
+    try:
+        greeting_frames = await greeting_task
+    except Exception:
+        logger.exception("Greeting: failed to load cached audio, falling back to live TTS")
+        greeting_frames = []
+    if greeting_frames:
+        await session.say(GREETING, audio=_replay(greeting_frames), allow_interruptions=True)
+    else:
+        await session.say(GREETING, allow_interruptions=True)
 
-    # Start main hall background music looping
-    main_hall_handle = background_audio.play(AudioConfig('assets/main_hall.mp3', volume=0.1), loop=True)
-    agent._current_audio_handle = main_hall_handle  # Track it in the agent
+    # Start main hall background music looping (tracked in the agent)
+    await agent._play_looped_clip('assets/main_hall.mp3', volume=0.1)
 
 
-    print("[DEBUG] Agent entrypoint finished.")
+    logger.info("Agent entrypoint finished.")
 
 if __name__ == "__main__":
-    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
+    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file